@@ -1,15 +1,79 @@
 import requests 
-import json
-import datetime
-from queue import Queue
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson # Fast JSON (de)serialization for FMC payloads
+import ijson # Incremental JSON parser for large FMC listings
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm # Progress bar library for terminal output
 import logging
 import time
+import random
+import os
+import threading
 
 logger = logging.getLogger()
 
+HEALTHY_STATES = frozenset(["green", "yellow", "recovered"]) # FMC healthStatus values counted as ready
+BULK_UNSUPPORTED = frozenset([400, 404, 405]) # Bulk registration statuses of FMC releases without ?bulk=true
+
+
+# One progress bar per deployment phase, shared by every FTDFirewall_HA instance
+PROGRESS_PHASES = (
+    ("api_key", "Getting API Keys"),
+    ("register", "Registering Devices on FMC"),
+    ("commit_interfaces", "Commit Changes - HA Interfaces"),
+    ("enable_ha", "Enable HA"),
+    ("commit_ha", "Commit Changes- HA Config"),
+)
+PROGRESS = {}
+progress_lock = threading.Lock()
+
+
+def init_progress(total, colors):
+    """
+    Create the shared per-phase progress bars, or grow their totals if they already exist.
+
+    Args:
+        total (int): Number of units this caller adds to every phase.
+        colors (dict): A dictionary containing color codes for formatting.
+
+    Returns:
+        dict: The shared progress bars keyed by phase.
+    """
+    with progress_lock:
+        if PROGRESS:
+            for bar in PROGRESS.values():
+                bar.total += total
+                bar.refresh()
+            return PROGRESS
+        # Install tqdm's shared lock once, before any bar exists, so worker threads never
+        # race to create it; lock_args=(False,) makes a busy lock skip the repaint
+        # instead of blocking the caller
+        tqdm.set_lock(threading.RLock())
+        cyan, reset = colors["cyan"], colors["reset"]
+        for position, (phase, label) in enumerate(PROGRESS_PHASES):
+            PROGRESS[phase] = tqdm(total=total, desc=f'{cyan}{label}{reset}', position=position, leave=True, ncols=100,
+                                   mininterval=0.3, miniters=1, smoothing=0, lock_args=(False,))
+        return PROGRESS
+
+
+def close_progress():
+    """Close and forget the shared progress bars."""
+    with progress_lock:
+        for bar in PROGRESS.values():
+            bar.close()
+        PROGRESS.clear()
+
 
 class FTDFirewall_HA:
+    # FMC access tokens keyed by (token url, username) -> (token, expiry epoch).
+    # FMC tokens are valid for 30 minutes, cached ones are reused for 25.
+    _token_cache = {}
+    TOKEN_TTL = 1500
+    # Initial_policy id keyed by policy url; the policy is shared by every HA pair, so
+    # it is looked up once per process
+    _policy_cache = {}
+
     def __init__(
         self,
         fmc_creds_payload,
@@ -18,7 +82,9 @@ class FTDFirewall_HA:
         fmc_devices_payload,
         fmc_devices_api,
         dev_detail_url_api,
-        colors
+        colors,
+        poll_interval=10,
+        deploy_poll_interval=30
     ):
 
         self.fmc_creds_payload = fmc_creds_payload
@@ -28,30 +94,60 @@ class FTDFirewall_HA:
         self.fmc_devices_api = fmc_devices_api
         self.dev_detail_url_api = dev_detail_url_api
         self.device_name = []
-        self.device_names = []
+        self.device_names = set()
+        self._expected = frozenset()
         self.ready_devices = {}
 
 
         self.colors = colors
 
+        # Polling intervals (seconds), overridable from the environment to relax FMC API usage
+        self.poll_interval = float(os.environ.get("FTD_POLL_INTERVAL", poll_interval))
+        self.deploy_poll_interval = float(os.environ.get("FTD_DEPLOY_POLL_INTERVAL", deploy_poll_interval))
+
         self.username = self.fmc_creds_payload[0]['username']
         self.password = self.fmc_creds_payload[0]['password']
         self.headers = {"Content-Type": "application/json"}
 
+        # Single pooled session so every FMC call reuses the same TLS connection
+        self.session = requests.Session()
+        # Transient FMC errors (rate limiting, busy gateway) are retried with jittered backoff
+        retry = Retry(
+            total=5,
+            backoff_factor=1,
+            backoff_jitter=1.0,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=frozenset(["GET", "POST"]),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.verify = False
+        self.session.headers.update(self.headers)
+        self.timeout = (5, 30) # (connect, read) seconds for every FMC call
+        # Long-lived workers for concurrent FMC calls; sized to the connection pool so
+        # every in-flight request gets a warm keep-alive connection
+        self.executor = ThreadPoolExecutor(max_workers=16)
+
         self.total_devices = len(self.fmc_creds_payload)
 
-        self.get_api_key = tqdm(total=self.total_devices, desc=f'{colors.get("cyan")}Getting API Keys{colors.get("reset")}', position=0, leave=True, ncols=100)
-        self.fmc_register_progress = tqdm(total=self.total_devices, desc=f'{colors.get("cyan")}Registering Devices on FMC{colors.get("reset")}', position=1, leave=True, ncols=100)
-        self.commit_interfaces = tqdm(total=self.total_devices, desc=f'{colors.get("cyan")}Commit Changes - HA Interfaces{colors.get("reset")}', position=2, leave=True, ncols=100)
-        self.enable_ha = tqdm(total=self.total_devices, desc=f'{colors.get("cyan")}Enable HA{colors.get("reset")}', position=3, leave=True, ncols=100)
-        self.commit_ha = tqdm(total=self.total_devices, desc=f'{colors.get("cyan")}Commit Changes- HA Config{colors.get("reset")}', position=4, leave=True, ncols=100)
+        init_progress(self.total_devices, colors)
 
     def get_api_keys(self):
             
         try:
             requests.packages.urllib3.disable_warnings()
+            cache_key = (self.fmc_token_api, self.username)
+            cached = FTDFirewall_HA._token_cache.get(cache_key)
+            if cached and cached[1] - time.time() > 60:
+                logger.info("Reusing cached FMC authentication token.")
+                self.headers["X-auth-access-token"] = cached[0]
+                self.session.headers["X-auth-access-token"] = cached[0]
+                PROGRESS["api_key"].update(1) # Update progress bar for getting API keys
+                return self.headers
             # Generate Token
-            response_token = requests.post(self.fmc_token_api, headers=self.headers, auth=(self.username, self.password), verify=False)
+            response_token = self._request("POST", self.fmc_token_api, auth=(self.username, self.password))
             response_token.raise_for_status()
             # Extract tokens from headers
             auth_token = response_token.headers.get("X-auth-access-token", None)
@@ -59,83 +155,152 @@ class FTDFirewall_HA:
                 raise Exception("Authentication token not found in response.")
             logger.info(f"Authentication successful! Token: {auth_token}")
             self.headers["X-auth-access-token"] = auth_token  
-            self.get_api_key.update(1) # Update progress bar for getting API keys
+            self.session.headers["X-auth-access-token"] = auth_token
+            FTDFirewall_HA._token_cache[cache_key] = (auth_token, time.time() + self.TOKEN_TTL)
+            PROGRESS["api_key"].update(1) # Update progress bar for getting API keys
         except requests.exceptions.RequestException as e:
             logger.error(f"Error: {e}")
         return self.headers
+
+    def _request(self, method, url, **kwargs):
+        """Issue an FMC API call on the pooled session with the default timeout."""
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def _register_one(self, device):
+        """POST a single device registration and return it with the FMC response."""
+        return device, self._request("POST", self.fmc_devices_api, data=orjson.dumps(device))
+
+    @staticmethod
+    def _accepted(response, device_name):
+        """
+        Return True if a registration response shows FMC accepted the device.
+
+        A bulk response carries one record per device in `items`; a device missing from
+        it was not accepted. A 202 whose body cannot be parsed counts as accepted.
+        """
+        if response.status_code != 202:
+            return False
+        try:
+            body = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            return True
+        return any(item.get("name", device_name) == device_name for item in body.get("items", [body]))
+
+    def _sleep_backoff(self, attempt, interval, cap=60):
+        """
+        Sleep using jittered exponential backoff and return the delay slept.
+
+        The delay never drops below the configured `interval` and grows up to
+        max(cap, interval), so a larger interval always means fewer FMC calls.
+        """
+        delay = random.uniform(interval, min(max(cap, interval), interval * 2 ** attempt))
+        time.sleep(delay)
+        return delay
+
+    def _get_device_detail(self, dev):
+        """GET the FMC device record detail for a single device."""
+        detail_resp = self._request("GET", self.dev_detail_url_api.format(device_id=dev['id']))
+        detail_resp.raise_for_status()
+        return orjson.loads(detail_resp.content)
+
     def register_device(self):
         try:
-            poll_interval = 10
             waited = 0
-            response_policy = requests.get(self.fmc_policyid_url, headers=self.headers, verify=False)
-            response_policy.raise_for_status()
-            policies = response_policy.json().get('items', []) # List of policies
-            policy_id = None
-            for policy in policies:
-                if policy["name"] == "Initial_policy":
-                    policy_id = policy["id"]
-                    break
-
+            policy_id = FTDFirewall_HA._policy_cache.get(self.fmc_policyid_url)
             if not policy_id:
-                logger.info("Initial_policy not found.")
-                return
+                response_policy = self._request("GET", self.fmc_policyid_url)
+                response_policy.raise_for_status()
+                policies = orjson.loads(response_policy.content).get('items', []) # List of policies
+                policy_id = next((policy["id"] for policy in policies if policy["name"] == "Initial_policy"), None)
+
+                if not policy_id:
+                    logger.info("Initial_policy not found.")
+                    return
+                FTDFirewall_HA._policy_cache[self.fmc_policyid_url] = policy_id
 
             # Assign policy ID to each device
             for device in self.fmc_devices_payload["device_payload"]:
                 device["accessPolicy"]["id"] = policy_id
-                logger.info(f"Assigned policy ID {policy_id} to device {device['name']}")
+                logger.info("Assigned policy ID %s to device %s", policy_id, device['name'])
             
             ### REGISTER DEVICES TO FMC ###
 
-            for device in self.fmc_devices_payload["device_payload"]:
+            # Register every device in a single bulk call; only FMC releases that do not
+            # support ?bulk=true get concurrent per-device POSTs. Any other failure may
+            # already have been partly applied, so it is reported rather than re-sent.
+            devices_payload = self.fmc_devices_payload["device_payload"]
+            response_bulk = self._request("POST", f"{self.fmc_devices_api}?bulk=true", data=orjson.dumps(devices_payload))
+            if response_bulk.status_code in BULK_UNSUPPORTED:
+                logger.info(f"Bulk registration not supported (status code {response_bulk.status_code}), registering devices individually.")
+                registrations = list(self.executor.map(self._register_one, devices_payload))
+            else:
+                registrations = [(device, response_bulk) for device in devices_payload]
+            for device, response_device in registrations:
                 self.device_name = device["name"]
-                response_device = requests.post(self.fmc_devices_api, headers=self.headers, data=json.dumps(device), verify=False)
-                if response_device.status_code == 202:
-                    logger.info(f"Device {self.device_name} added successfully.")
+                if self._accepted(response_device, self.device_name):
+                    logger.info("Device %s added successfully.", self.device_name)
+                    self.device_names.add(self.device_name)
                 else:
-                    logger.info(f"Failed to add device {self.device_name}. Status code: {response_device.status_code}")
+                    logger.info("Failed to add device %s. Status code: %s", self.device_name, response_device.status_code)
                     logger.info(response_device.text)
-            for name in self.fmc_devices_payload["device_payload"]:
-                self.device_names.append(name['name'])
+            if not self.device_names:
+                logger.error("No devices were registered to FMC.")
+                return
+            self._expected = frozenset(self.device_names)
             # Wait for all devices to appear in FMC device records
             max_wait = 600  # seconds
             waited_rec = 0 
-            poll_interval = 10 
-            pool_interval_reg = 30
+            deadline = time.monotonic() + max_wait
+            attempt = 0
+            last_missing = None
             while True:
-                response_show = requests.get(self.fmc_devices_api, headers=self.headers, verify=False)
-                response_show.raise_for_status()
-                devices = response_show.json().get('items', [])
-                found_device_names = [dev["name"] for dev in devices]
-                missing_devices = set(self.device_names) - set(found_device_names)
+                # Only device names are needed here, so stream-parse them instead of
+                # materializing every device record
+                with self._request("GET", self.fmc_devices_api, stream=True) as response_show:
+                    response_show.raise_for_status()
+                    response_show.raw.decode_content = True
+                    missing_devices = self._expected.difference(ijson.items(response_show.raw, 'items.item.name'))
                 if not missing_devices:
                     logger.info("All devices have appeared in FMC device records.")
                     break
-                if waited_rec > max_wait:
+                if time.monotonic() > deadline:
                     logger.error(f"Timeout: Devices {missing_devices} did not appear in FMC device records after {max_wait} seconds.")
                     return
-                logger.info(f"Waiting for devices to appear in FMC: {missing_devices} ({waited_rec}s)")
-                time.sleep(poll_interval)
-                waited_rec += poll_interval
+                if len(missing_devices) != last_missing:
+                    attempt = 0 # Progress was made, poll eagerly again
+                    last_missing = len(missing_devices)
+                logger.info("Waiting for devices to appear in FMC: %s (%.0fs)", missing_devices, waited_rec)
+                waited_rec += self._sleep_backoff(attempt, self.poll_interval)
+                attempt += 1
+            max_deploy_wait = 3600  # seconds
+            deploy_deadline = time.monotonic() + max_deploy_wait
+            attempt = 0
+            last_ready = None
             while True:
-                response_health_status = requests.get(self.fmc_devices_api, headers=self.headers, verify=False)
+                response_health_status = self._request("GET", self.fmc_devices_api)
                 response_health_status.raise_for_status()
-                devices = response_health_status.json().get('items', [])
-                for dev in devices:
-                    if dev["name"] in self.device_names:
-                        detail_resp = requests.get(self.dev_detail_url_api.format(device_id=dev['id']), headers=self.headers, verify=False)
-                        detail_resp.raise_for_status()
-                        dev_detail = detail_resp.json()
-                        health = dev_detail.get("healthStatus", "").lower()
-                        deploy = dev_detail.get("deploymentStatus", "").upper()
-                        logger.info(f"Device {dev['name']} healthStatus: {health}, deploymentStatus: {deploy}")
-                        healthy_states = ["green", "yellow", "recovered"]
-                        if health in healthy_states and deploy == "DEPLOYED" and dev["name"] not in self.ready_devices:
-                            self.ready_devices[dev["name"]] = dev
-                            self.fmc_register_progress.update(1)
-                        if health == "red" and deploy == "NOT_DEPLOYED":
-                            logger.info(f"Device {dev['name']} is not deployed. Please check logs...")
-                            continue
+                devices = orjson.loads(response_health_status.content).get('items', [])
+                found = {dev["name"]: dev for dev in devices}
+                # One listing per cycle covers every device; only those not yet ready need a
+                # detail GET, fetched concurrently so each poll cycle costs about one RTT
+                pending = self._expected.difference(self.ready_devices)
+                missing_devices = pending - found.keys()
+                pending_devices = [found[name] for name in pending & found.keys()]
+                details = list(self.executor.map(self._get_device_detail, pending_devices))
+                newly_ready = 0
+                for dev, dev_detail in zip(pending_devices, details):
+                    health = dev_detail.get("healthStatus", "").lower()
+                    deploy = dev_detail.get("deploymentStatus", "").upper()
+                    logger.info("Device %s healthStatus: %s, deploymentStatus: %s", dev['name'], health, deploy)
+                    if health in HEALTHY_STATES and deploy == "DEPLOYED":
+                        self.ready_devices[dev["name"]] = dev
+                        newly_ready += 1
+                    if health == "red" and deploy == "NOT_DEPLOYED":
+                        logger.info("Device %s is not deployed. Please check logs...", dev['name'])
+                        continue
+                if newly_ready:
+                    PROGRESS["register"].update(newly_ready) # One bar update per poll cycle
                 if missing_devices:
                     logger.error(f"Device(s) {missing_devices} are no longer present in FMC device records. Registration or deployment likely failed.")
                     break
@@ -143,14 +308,31 @@ class FTDFirewall_HA:
                     logger.info("All devices are ready and deployed!")
                     break
                 if waited > 1800:  # 30 minutes, just as a warning
-                    logger.info(f"Warning: Devices are taking longer than expected to be ready. Waited {waited} seconds.")
-                logger.info(f"Waiting... ({waited}s)")
-                time.sleep(pool_interval_reg)
-                waited += pool_interval_reg
+                    logger.info("Warning: Devices are taking longer than expected to be ready. Waited %.0f seconds.", waited)
+                if time.monotonic() > deploy_deadline:
+                    logger.error(f"Devices not ready after {max_deploy_wait} seconds.")
+                    break
+                if len(self.ready_devices) != last_ready:
+                    attempt = 0 # A device changed state, poll eagerly again
+                    last_ready = len(self.ready_devices)
+                logger.info("Waiting... (%.0fs)", waited)
+                waited += self._sleep_backoff(attempt, self.deploy_poll_interval)
+                attempt += 1
 
             if len(self.ready_devices) < len(self.device_names):
                 logger.info("Timeout waiting for devices to be ready.")
                 return
         except requests.exceptions.RequestException as e:
             logger.error(f"Error: {e}")
-        
\ No newline at end of file
+        except (orjson.JSONDecodeError, ijson.JSONError) as e:
+            logger.error(f"Invalid JSON response from FMC: {e}")
+
+    def deploy(self):
+        """Authenticate and register this HA pair's devices, blocking until they are ready."""
+        self.get_api_keys()
+        self.register_device()
+
+    def close(self):
+        """Stop the worker threads and close the pooled HTTP session."""
+        self.executor.shutdown(wait=True)
+        self.session.close()
@@ -16,10 +16,12 @@ GitHub: https://github.com/jotape75
 """
 
 import logging
+from logging.handlers import QueueHandler, QueueListener
+from queue import Queue
 from utils_ftd import file_path,display_message, color_text
-from ftd_automation_ha import FTDFirewall_HA
+from ftd_automation_ha import FTDFirewall_HA, close_progress
+from concurrent.futures import ThreadPoolExecutor
 import datetime
-from tqdm import tqdm
 
 
 
@@ -30,13 +32,43 @@ formatted_timestamp = timestamp.strftime("%Y-%m-%d %H:%M:%S") # Format the times
 # log file name for WINDOWS
 
 LOG_FILE = f'/home/user/pystudies/myenv/pythonbasic/projects/FTD_automation_deploy/log/{formatted_timestamp}_main_log_file.log'  # Specify the log file path
+# Log records are queued and written to disk by a background listener thread,
+# so file I/O never blocks the FMC polling loops
+file_handler = logging.FileHandler(LOG_FILE)  # Log file
+file_handler.setFormatter(logging.Formatter(
+    "%(asctime)s - %(levelname)s - %(message)s",  # Log format
+    datefmt="%Y-%m-%d %H:%M:%S"  # Date format
+))
+log_queue = Queue(-1)
+log_listener = QueueListener(log_queue, file_handler)
 logging.basicConfig(
-    filename=LOG_FILE,  # Log file
     level=logging.DEBUG,  # Log level (DEBUG captures all levels)
-    format="%(asctime)s - %(levelname)s - %(message)s",  # Log format
-    datefmt="%Y-%m-%d %H:%M:%S"  # Date format
+    handlers=[QueueHandler(log_queue)]
 )
 
+# HA pairs deployed at once; every pair polls the same FMC, whose REST API is rate-limited
+# per client (120 requests/minute), so this is bounded by FMC rather than by local CPUs
+MAX_CONCURRENT_DEPLOYMENTS = 4
+
+def deploy_all(deployers):
+    """
+    Deploy several HA pairs concurrently.
+
+    Each FTDFirewall_HA spends most of its time sleeping in the FMC readiness polls,
+    so running the pairs side by side overlaps those waits instead of serializing them.
+
+    Args:
+        deployers (list): FTDFirewall_HA instances, one per HA pair.
+
+    Returns:
+        None
+    """
+    # Bounded so a long list of pairs cannot spawn an unbounded number of threads, each
+    # with its own worker pool and FMC connections
+    with ThreadPoolExecutor(max_workers=max(1, min(len(deployers), MAX_CONCURRENT_DEPLOYMENTS))) as executor:
+        for future in [executor.submit(deployer.deploy) for deployer in deployers]:
+            future.result()
+
 def main():
 
     """
@@ -67,6 +99,8 @@ def main():
     Returns:
         None
     """
+    firewall_deployer_ha = None
+    log_listener.start()
     try:
         # Display the introductory message
         colors = color_text()  # Get color codes
@@ -76,27 +110,26 @@ def main():
 
         # Load configuration and credentials
         
-        fmc_creds_payload, \
-        fmc_token_api, \
-        fmc_policyid_url, \
-        fmc_devices_payload, \
-        fmc_devices_api, \
-        dev_detail_url_api = file_path()
+        config = file_path()
 
         # Creating an instance of the class
-        firewall_deployer_ha = FTDFirewall_HA(fmc_creds_payload,
-                                              fmc_token_api, 
-                                              fmc_policyid_url, 
-                                              fmc_devices_payload,
-                                              fmc_devices_api,
-                                              dev_detail_url_api, 
+        firewall_deployer_ha = FTDFirewall_HA(config.fmc_creds_payload,
+                                              config.fmc_token_api,
+                                              config.fmc_policyid_url,
+                                              config.fmc_devices_payload,
+                                              config.fmc_devices_api,
+                                              config.dev_detail_url_api,
                                               colors)
-        # Get API keys
-        firewall_deployer_ha.get_api_keys()
-        firewall_deployer_ha.register_device()
+        # Get API keys and register devices
+        deploy_all([firewall_deployer_ha])
 
     except Exception as e:
         logging.error(f"An unexpected error occurred: {e}", exc_info=True)  
+    finally:
+        if firewall_deployer_ha is not None:
+            firewall_deployer_ha.close()
+        close_progress()
+        log_listener.stop()
 
 
 if __name__ == "__main__":
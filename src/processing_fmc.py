@@ -44,6 +44,7 @@ Args:
     fmc_routing_url (str): FMC static routing API endpoint
     fmc_dev_int_url (str): FMC device interfaces API endpoint
     fmc_ha_check_url (str): FMC HA pair status checking API endpoint
+    fmc_task_status_url (str): FMC job task status API endpoint with task_id placeholder
 
 Returns:
     None: Function performs configuration operations and updates progress queues.
@@ -76,15 +77,182 @@ Production Considerations:
 """
 
 import requests 
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson # Fast JSON serialization for FMC payloads
+import ijson # Incremental JSON parser for large FMC listings
 import datetime
 from queue import Queue
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm # Progress bar library for terminal output
 import logging
 import time
+import random
+import threading
+from exceptions_ftd import InvalidDataError
 
 logger = logging.getLogger()
 
+HTTP_TIMEOUT = (5, 30) # (connect, read) seconds for every FMC call
+HEALTHY_STATES = frozenset(["green", "yellow", "recovered"]) # FMC healthStatus values counted as ready
+BULK_UNSUPPORTED = frozenset([400, 404, 405]) # Bulk registration statuses of FMC releases without ?bulk=true
+
+# Repaint at most twice a second and skip the redraw instead of blocking if another
+# bar holds the lock; the lock itself is installed by fmc_register before any bar exists
+PROGRESS_OPTS = {"mininterval": 0.5, "miniters": 1, "smoothing": 0, "lock_args": (False,)}
+
+TOKEN_TTL = 25 * 60 # FMC tokens expire after 30 minutes, refresh a little early
+_TOKEN_CACHE = {} # (fmc_token url, username) -> (token, acquired at)
+_token_lock = threading.Lock()
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout to every request sent through it."""
+
+    def __init__(self, *args, timeout=HTTP_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def _backoff(attempt, base=5, cap=60):
+    """Return an exponential backoff delay in seconds, capped at `cap`, plus up to `base` of jitter."""
+    return min(cap, base * 2 ** attempt) + random.uniform(0, base)
+
+
+def _get_token(session, fmc_token, username, password, force=False):
+    """
+    Return an FMC access token, reusing a cached one while it is still fresh.
+
+    Args:
+        session (requests.Session): Session used for the token POST.
+        fmc_token (str): FMC API token generation endpoint URL.
+        username (str): FMC API username.
+        password (str): FMC API password.
+        force (bool): Ignore the cache and always request a new token.
+
+    Returns:
+        str: The X-auth-access-token value.
+
+    Raises:
+        requests.exceptions.RequestException: If the token request fails.
+        Exception: If FMC does not return a token.
+    """
+    cache_key = (fmc_token, username)
+    with _token_lock:
+        cached = _TOKEN_CACHE.get(cache_key)
+        if cached and not force and time.time() - cached[1] < TOKEN_TTL:
+            logger.info("Reusing cached FMC authentication token.")
+            return cached[0]
+        response_token = session.post(fmc_token, auth=(username, password))
+        response_token.raise_for_status()
+        auth_token = response_token.headers.get("X-auth-access-token", None)
+        if not auth_token:
+            raise Exception("Authentication token not found in response.")
+        logger.info(f"Authentication successful! Token: {auth_token}")
+        _TOKEN_CACHE[cache_key] = (auth_token, time.time())
+        return auth_token
+
+
+def _registration_record(response, device_name):
+    """
+    Return the record FMC accepted for a device from a registration response, or None.
+
+    Handles both a single devicerecords response and a bulk response whose `items`
+    carry one record per device; a device missing from a bulk response was not
+    accepted. A 202 whose body cannot be parsed counts as accepted, with an empty record.
+    """
+    if response.status_code != 202:
+        return None
+    try:
+        body = response.json()
+    except ValueError:
+        return {}
+    for item in body.get("items", [body]):
+        if item.get("name", device_name) == device_name:
+            return item
+    return None
+
+
+def _stream_items(response, wanted):
+    """
+    Stream-parse the `items` of an FMC listing, keeping only the records named in `wanted`.
+
+    The rest of the listing is parsed and discarded record by record instead of being
+    materialized as one large dict. The body is read to the end so the connection
+    goes back to the pool.
+
+    Args:
+        response (requests.Response): Response of a GET issued with stream=True.
+        wanted (iterable): Names of the records to keep.
+
+    Returns:
+        dict: {"items": [...], "count": n} with only the wanted records, in listing
+        order, and the number of records the listing held.
+    """
+    wanted = set(wanted)
+    response.raw.decode_content = True
+    items = []
+    count = 0
+    for item in ijson.items(response.raw, 'items.item'):
+        count += 1
+        if item.get("name") in wanted:
+            items.append(item)
+    return {"items": items, "count": count}
+
+
+def _get_json(session, url):
+    """GET an FMC endpoint and return its decoded JSON body, raising on an HTTP error."""
+    with session.get(url) as response:
+        response.raise_for_status()
+        return response.json()
+
+
+def _poll(fetch_fn, done_fn, max_wait, base=5, progress_fn=None, label="FMC"):
+    """
+    Poll an FMC endpoint with exponential backoff until a predicate accepts its response.
+
+    Args:
+        fetch_fn (callable): Issues the GET and returns the decoded JSON body.
+        done_fn (callable): Receives the decoded JSON body, returns True when polling is done.
+        max_wait (float): Maximum total time to sleep between polls, in seconds.
+        base (float): Base backoff delay in seconds.
+        progress_fn (callable): Optional, maps the JSON body to a value; the backoff resets
+            whenever that value changes so the next poll happens quickly.
+        label (str): Description used in log messages.
+
+    Returns:
+        dict: The JSON body accepted by `done_fn`.
+
+    Raises:
+        requests.exceptions.RequestException: If a poll request fails.
+        TimeoutError: If `max_wait` would be exceeded before `done_fn` succeeds.
+    """
+    waited = 0
+    attempt = 0
+    last_progress = None
+    while True:
+        body = fetch_fn()
+        if done_fn(body):
+            return body
+        if progress_fn is not None:
+            progress = progress_fn(body)
+            if progress != last_progress:
+                attempt = 0 # State moved, poll eagerly again
+                last_progress = progress
+        delay = _backoff(attempt, base)
+        if waited + delay > max_wait:
+            raise TimeoutError(f"{label} not ready after {waited:.0f} seconds.")
+        logger.info(f"Waiting for {label}... ({waited:.0f}s)")
+        time.sleep(delay)
+        waited += delay
+        attempt += 1
+
+
 def fmc_register(
     fmc_creds,
     fmc_token,
@@ -111,7 +279,8 @@ def fmc_register(
     fmc_obj_host_url,
     fmc_routing_url,
     fmc_dev_int_url,
-    fmc_ha_check_url
+    fmc_ha_check_url,
+    fmc_task_status_url
     ):
 
     devices_count = len(fmc_payload['device_payload']) # Number of devices to register
@@ -124,362 +293,590 @@ def fmc_register(
     password = fmc_creds[0]['password']
     ready_devices = {}
     poll_interval = 10
-    waited = 0    
     device_names = []
     devices_list = [] # Initialize an empty list to store devices
+    primary_status_id = None # Active HA unit, captured by the HA status poll
+    primary_name = None
 
     logger.info(f"Registering {devices_count} to FMC...")
 
-    # Initialize progress bars
+    RED = colors.get("red", "")
+    YELLOW = colors.get("yellow", "")
+    RESET = colors.get("reset", "")
+
+    def put_error(queue, msg, color=RED):
+        """Put a timestamped, colored error message on a status queue."""
+        queue.put(f"{color}{datetime.datetime.now().isoformat(timespec='seconds')} - {msg}{RESET}")
+
+    def put_ok(queue, msg):
+        """Put a timestamped success message on a status queue."""
+        queue.put(f"{datetime.datetime.now().isoformat(timespec='seconds')} {msg}")
 
-    fmc_register_progress  = tqdm(total=devices_count, desc=f'{colors.get("green")}Registering on FMC{colors.get("reset")}', position=0, leave=True, ncols=100)
-    fmc_ha_progress        = tqdm(total=ha_count, desc=f'{colors.get("green")}Configuring HA {colors.get("reset")}', position=1, leave=True, ncols=100)
-    fmc_seczone_progress   = tqdm(total=sec_zone_count, desc=f'{colors.get("green")}Creating Security Zones on FMC{colors.get("reset")}', position=2, leave=True, ncols=100)
-    fmc_interface_progress = tqdm(total=total_interfaces, desc=f'{colors.get("green")}Configuring Interfaces{colors.get("reset")}', position=3, leave=True, ncols=100)
-    fmc_host_obj_progress = tqdm(total=host_object_count, desc=f'{colors.get("green")}Configuring Host Object{colors.get("reset")}', position=4, leave=True, ncols=100)
-    fmc_route_progress = tqdm(total=route_object_count, desc=f'{colors.get("green")}Configuring Default Route{colors.get("reset")}', position=5, leave=True, ncols=100)
+    # Initialize progress bars
+    # Install tqdm's shared lock once, before any bar exists, so worker threads never
+    # race to create it
+    tqdm.set_lock(threading.RLock())
+    fmc_register_progress  = tqdm(total=devices_count, desc=f'{colors.get("green")}Registering on FMC{colors.get("reset")}', position=0, leave=True, ncols=100, **PROGRESS_OPTS)
+    fmc_ha_progress        = tqdm(total=ha_count, desc=f'{colors.get("green")}Configuring HA {colors.get("reset")}', position=1, leave=True, ncols=100, **PROGRESS_OPTS)
+    fmc_seczone_progress   = tqdm(total=sec_zone_count, desc=f'{colors.get("green")}Creating Security Zones on FMC{colors.get("reset")}', position=2, leave=True, ncols=100, **PROGRESS_OPTS)
+    fmc_interface_progress = tqdm(total=total_interfaces, desc=f'{colors.get("green")}Configuring Interfaces{colors.get("reset")}', position=3, leave=True, ncols=100, **PROGRESS_OPTS)
+    fmc_host_obj_progress = tqdm(total=host_object_count, desc=f'{colors.get("green")}Configuring Host Object{colors.get("reset")}', position=4, leave=True, ncols=100, **PROGRESS_OPTS)
+    fmc_route_progress = tqdm(total=route_object_count, desc=f'{colors.get("green")}Configuring Default Route{colors.get("reset")}', position=5, leave=True, ncols=100, **PROGRESS_OPTS)
 
     # Disable SSL warnings (not recommended for production)
     requests.packages.urllib3.disable_warnings()
     headers = {"Content-Type": "application/json"}
+
+    # One pooled session for every FMC call so connections are reused across requests
+    session = requests.Session()
+    adapter = TimeoutHTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+    )
+    session.mount("https://", adapter)
+    # verify is set on the session rather than per call: a per-call mismatch would keep
+    # urllib3 from reusing the pooled HTTPS connection (and its TLS session)
+    session.verify = False
+    session.headers.update(headers)
+    session.headers["Connection"] = "keep-alive"
+
+    background = None # Pool for the calls that do not depend on HA, created further down
     try:
-        # Generate Token
-        response_token = requests.post(fmc_token, headers=headers, auth=(username, password), verify=False)
-        response_token.raise_for_status()
-        # Extract tokens from headers
-        auth_token = response_token.headers.get("X-auth-access-token", None)
-        if not auth_token:
-            raise Exception("Authentication token not found in response.")
-        logger.info(f"Authentication successful! Token: {auth_token}")
-        headers["X-auth-access-token"] = auth_token
+        use_name_filter = {} # Listing endpoint (devicerecords, physicalinterfaces) -> name filter honoured
+
+        def get_filtered(url, names):
+            """
+            Helper to GET an FMC listing filtered server-side to `names`, returning
+            {"items": [...]} with only those records (streamed with _stream_items).
+            The first filtered response of each endpoint decides whether FMC honours the
+            filter; if it was rejected (400) or ignored, that endpoint is listed without it
+            for the rest of the run. Names missing later just mean the records do not exist yet.
+            """
+            endpoint = url.rstrip("/").rsplit("/", 1)[-1]
+            names = set(names)
+
+            def get_unfiltered():
+                with session.get(url, stream=True) as response:
+                    response.raise_for_status()
+                    return _stream_items(response, names)
+
+            if use_name_filter.get(endpoint) is False:
+                return get_unfiltered()
+            with session.get(url, params={"filter": "name:" + ",".join(names)}, stream=True) as response:
+                if response.status_code == 400:
+                    listing = None
+                else:
+                    response.raise_for_status()
+                    listing = _stream_items(response, names)
+            if listing is None:
+                use_name_filter[endpoint] = False
+                logger.info(f"FMC rejected the name filter on {endpoint}, listing without it.")
+                return get_unfiltered()
+            if endpoint in use_name_filter:
+                return listing
+            if listing["count"] > len(listing["items"]):
+                # Records that were not asked for came back: the filter was ignored
+                use_name_filter[endpoint] = False
+                logger.info(f"FMC ignored the name filter on {endpoint}, listing without it.")
+                return listing
+            if names <= {item["name"] for item in listing["items"]}:
+                use_name_filter[endpoint] = True
+                return listing
+            # First filtered listing of this endpoint lacks some names: check once, without
+            # the filter, that FMC matched it rather than taking it literally
+            unfiltered = get_unfiltered()
+            use_name_filter[endpoint] = len(unfiltered["items"]) <= len(listing["items"])
+            if not use_name_filter[endpoint]:
+                logger.info(f"FMC did not match the name filter on {endpoint}, listing without it.")
+            return unfiltered
+
+        try:
+            # Generate Token (or reuse a cached one from an earlier run)
+            headers["X-auth-access-token"] = _get_token(session, fmc_token, username, password)
+            session.headers.update(headers)
+
+            def refresh_on_401(response, *args, **kwargs):
+                """
+                Response hook: if FMC rejects the (cached) token, fetch a new one and resend once.
+                """
+                if response.status_code != 401 or response.request.url.startswith(fmc_token):
+                    return response
+                logger.info("FMC token rejected, requesting a new one.")
+                session.headers["X-auth-access-token"] = _get_token(session, fmc_token, username, password, force=True)
+                retry = response.request.copy()
+                retry.headers["X-auth-access-token"] = session.headers["X-auth-access-token"]
+                response.content # Drain the 401 so its connection goes back to the pool
+                response.close()
+                # Send through the adapter directly, as requests' own auth handlers do, so the
+                # hook is not run again on the retried response
+                retried = response.connection.send(retry, **kwargs)
+                retried.history.append(response)
+                retried.request = retry
+                return retried
+
+            session.hooks["response"].append(refresh_on_401)
         
-        # Retrieve Access Control Policy ID
-        response_policy = requests.get(fmc_policyid_url, headers=headers, verify=False)
-        response_policy.raise_for_status()
-        policies = response_policy.json().get('items', [])
-        policy_id = None
-        for policy in policies:
-            if policy["name"] == "Initial_policy":
-                policy_id = policy["id"]
-                break
-
-        if not policy_id:
-            logger.info("Initial_policy not found.")
-            return
+            # Retrieve Access Control Policy ID
+            response_policy = session.get(fmc_policyid_url)
+            response_policy.raise_for_status()
+            policies = response_policy.json().get('items', [])
+            policy_id = next((policy["id"] for policy in policies if policy["name"] == "Initial_policy"), None)
+
+            if not policy_id:
+                logger.info("Initial_policy not found.")
+                return
 
-        # Assign policy ID to each device
-        for device in fmc_payload["device_payload"]:
-            device["accessPolicy"]["id"] = policy_id
+            # Assign policy ID to each device
+            for device in fmc_payload["device_payload"]:
+                device["accessPolicy"]["id"] = policy_id
 
-        ### REGISTER DEVICES TO FMC ###
+            ### REGISTER DEVICES TO FMC ###
 
-        for device in fmc_payload["device_payload"]:
-            device_name = device["name"]
-            response_device = requests.post(fmc_devices, headers=headers, data=json.dumps(device), verify=False)
-            if response_device.status_code == 202:
-                logger.info(f"Device {device_name} added successfully.")
-                fmc_register_queue.put(f"{datetime.datetime.now() } Device {device_name} registered successfully to FMC.")
+            def _register(device):
+                return device["name"], session.post(fmc_devices, data=orjson.dumps(device))
+
+            # Register all devices in one bulk call; only FMC releases that do not support
+            # ?bulk=true get concurrent per-device POSTs. Any other failure may already have
+            # been partly applied, so it is reported rather than re-sent.
+            response_bulk = session.post(f"{fmc_devices}?bulk=true", data=orjson.dumps(fmc_payload["device_payload"]))
+            if response_bulk.status_code in BULK_UNSUPPORTED:
+                logger.info(f"Bulk registration not supported (status code {response_bulk.status_code}), registering devices individually.")
+                with ThreadPoolExecutor(max_workers=max(1, min(8, devices_count))) as executor:
+                    registrations = list(executor.map(_register, fmc_payload["device_payload"]))
             else:
-                logger.info(f"Failed to add device {device_name}. Status code: {response_device.status_code}")
-                logger.info(response_device.text)
-                fmc_register_queue.put(f'{colors.get("red")}{datetime.datetime.now()} - "Failed to add device {device_name}. Status code: {response_device.status_code}{colors.get("reset")}')
-        for name in fmc_payload["device_payload"]:
-            device_names.append(name['name'])
-        # Wait for all devices to appear in FMC device records
-        max_wait = 600  # seconds
-        waited_rec = 0 
-        poll_interval = 10 
-        pool_interval_reg = 30
-        while True:
-            response_show = requests.get(fmc_devices, headers=headers, verify=False)
-            response_show.raise_for_status()
-            devices = response_show.json().get('items', [])
-            found_device_names = [dev["name"] for dev in devices]
-            missing_devices = set(device_names) - set(found_device_names)
-            if not missing_devices:
+                registrations = [(device["name"], response_bulk) for device in fmc_payload["device_payload"]]
+            registered = {} # device name -> record FMC returned for it
+            for device_name, response_device in registrations:
+                record = _registration_record(response_device, device_name)
+                if record is not None:
+                    registered[device_name] = record
+                    logger.info(f"Device {device_name} added successfully.")
+                    put_ok(fmc_register_queue, f"Device {device_name} registered successfully to FMC.")
+                else:
+                    logger.info(f"Failed to add device {device_name}. Status code: {response_device.status_code}")
+                    logger.info(response_device.text)
+                    put_error(fmc_register_queue, f"Failed to add device {device_name}. Status code: {response_device.status_code}")
+            # Only accepted devices are waited on
+            device_names.extend(registered)
+            if not device_names:
+                logger.error("No devices were registered to FMC.")
+                return
+            max_wait = 600  # seconds
+            # Follow the registration tasks FMC returned with the 202s, concurrently; a failed
+            # task is reported right away, and a device whose task succeeded is known to be
+            # in the device records, so only the rest need the appearance scan below
+            task_devices = {} # task id -> device names
+            for device_name, record in registered.items():
+                task_id = record.get("metadata", {}).get("task", {}).get("id")
+                if task_id:
+                    task_devices.setdefault(task_id, []).append(device_name)
+
+            def task_status(body):
+                return body.get("status", "").upper()
+
+            def task_finished(body):
+                return task_status(body) not in ("", "PENDING", "RUNNING", "IN_PROGRESS")
+
+            def wait_task(task_id):
+                """Poll one registration task until it finishes; None if it is still running after max_wait."""
+                try:
+                    return _poll(
+                        lambda: _get_json(session, fmc_task_status_url.format(task_id=task_id)),
+                        task_finished,
+                        max_wait,
+                        base=poll_interval / 2,
+                        progress_fn=task_status,
+                        label=f"registration task {task_id}"
+                    )
+                except TimeoutError as e:
+                    logger.info(f"Warning: {e}")
+                    return None
+
+            appeared = set() # Devices whose registration task succeeded
+            if task_devices:
+                with ThreadPoolExecutor(max_workers=max(1, min(8, len(task_devices)))) as executor:
+                    task_results = list(executor.map(wait_task, task_devices))
+                for (task_id, task_device_names), task_json in zip(task_devices.items(), task_results):
+                    if task_json is None:
+                        continue
+                    if "FAIL" in task_status(task_json):
+                        logger.error(f"Registration task {task_id} for {task_device_names} failed: {task_json.get('message', '')}")
+                        put_error(fmc_register_queue, f"Registration of {task_device_names} failed: {task_json.get('message', '')}")
+                        return
+                    appeared.update(task_device_names)
+
+            # Wait for the remaining devices to appear in FMC device records
+            max_deploy_wait = 3600  # seconds
+            poll_interval = 10 
+            pool_interval_reg = 30
+
+            unseen = set(device_names) - appeared
+            missing_devices = set()
+
+            def all_present(body):
+                missing_devices.clear()
+                missing_devices.update(unseen - {dev["name"] for dev in body.get('items', [])})
+                return not missing_devices
+
+            try:
+                if unseen:
+                    _poll(
+                        lambda: get_filtered(fmc_devices, unseen),
+                        all_present,
+                        max_wait,
+                        base=poll_interval / 2,
+                        progress_fn=lambda body: len(missing_devices),
+                        label="devices to appear in FMC"
+                    )
                 logger.info("All devices have appeared in FMC device records.")
-                break
-            if waited_rec > max_wait:
+            except TimeoutError:
                 logger.error(f"Timeout: Devices {missing_devices} did not appear in FMC device records after {max_wait} seconds.")
-                fmc_register_queue.put(f'{colors.get("red")}{datetime.datetime.now()} - "Devices {missing_devices} did not appear in FMC. Registration failed.{colors.get("reset")}')
+                put_error(fmc_register_queue, f"Devices {missing_devices} did not appear in FMC. Registration failed.")
                 return
-            logger.info(f"Waiting for devices to appear in FMC: {missing_devices} ({waited_rec}s)")
-            time.sleep(poll_interval)
-            waited_rec += poll_interval
-        while True:
-            response_health_status = requests.get(fmc_devices, headers=headers, verify=False)
-            response_health_status.raise_for_status()
-            devices = response_health_status.json().get('items', [])
-            for dev in devices:
-                if dev["name"] in device_names:
-                    detail_resp = requests.get(fmc_device_details_url.format(device_id=dev['id']), headers=headers, verify=False)
+
+            pending = set(device_names) # Devices not yet healthy and deployed
+
+            def check_ready(body):
+                """Update ready/pending devices from one poll; True once nothing is pending or a device vanished."""
+                devices = body.get('items', [])
+                pending_devices = [dev for dev in devices if dev["name"] in pending]
+                missing_devices.update(pending - {dev["name"] for dev in pending_devices})
+                if missing_devices:
+                    return True
+                # Only devices that are still pending need a detail GET, fetched concurrently
+                detail_responses = list(detail_pool.map(lambda dev: session.get(fmc_device_details_url.format(device_id=dev['id'])), pending_devices))
+                for dev, detail_resp in zip(pending_devices, detail_responses):
                     detail_resp.raise_for_status()
                     dev_detail = detail_resp.json()
                     health = dev_detail.get("healthStatus", "").lower()
                     deploy = dev_detail.get("deploymentStatus", "").upper()
                     logger.info(f"Device {dev['name']} healthStatus: {health}, deploymentStatus: {deploy}")
-                    healthy_states = ["green", "yellow", "recovered"]
-                    if health in healthy_states and deploy == "DEPLOYED" and dev["name"] not in ready_devices:    
+                    if health in HEALTHY_STATES and deploy == "DEPLOYED":
                         ready_devices[dev["name"]] = dev 
+                        pending.discard(dev["name"])
                         fmc_register_progress.update(1)
                     if health == "red" and deploy == "NOT_DEPLOYED":
                         logger.info(f"Device {dev['name']} is not deployed. Please check logs...")
-                        fmc_register_queue.put(f'{colors.get("yellow")}{datetime.datetime.now()} - "Device {dev["name"]} is not deployed. Waiting for deployment...{colors.get("reset")}')
-                        continue
+                        put_error(fmc_register_queue, f"Device {dev['name']} is not deployed. Waiting for deployment...", YELLOW)
+                return not pending
+
+            # One detail pool for the whole readiness wait, reused by every poll cycle
+            try:
+                with ThreadPoolExecutor(max_workers=4) as detail_pool:
+                    _poll(
+                        lambda: get_filtered(fmc_devices, pending),
+                        check_ready,
+                        max_deploy_wait,
+                        base=pool_interval_reg / 2,
+                        progress_fn=lambda body: len(ready_devices),
+                        label="devices to be ready and deployed"
+                    )
+            except TimeoutError as e:
+                logger.info(f"Warning: {e}")
             if missing_devices:
                 logger.error(f"Device(s) {missing_devices} are no longer present in FMC device records. Registration or deployment likely failed.")
-                fmc_register_queue.put(f'{colors.get("red")}{datetime.datetime.now()} - "Device(s) {missing_devices} disappeared from FMC. Registration or deployment failed.{colors.get("reset")}')
-                break
-            if len(ready_devices) == len(device_names):
+                put_error(fmc_register_queue, f"Device(s) {missing_devices} disappeared from FMC. Registration or deployment failed.")
+            elif not pending:
                 logger.info("All devices are ready and deployed!")
-                break
-            if waited > 1800:  # 30 minutes, just as a warning
-                logger.info(f"Warning: Devices are taking longer than expected to be ready. Waited {waited} seconds.")
-            logger.info(f"Waiting... ({waited}s)")
-            time.sleep(pool_interval_reg)
-            waited += pool_interval_reg
-
-        if len(ready_devices) < len(device_names):
-            logger.info("Timeout waiting for devices to be ready.")
+
+            if len(ready_devices) < len(device_names):
+                logger.info("Timeout waiting for devices to be ready.")
+                return
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error: {e}")
+            put_error(fmc_register_queue, f"Error: {e}")
             return
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error: {e}")
-        fmc_register_queue.put(f'{colors.get("red")}{datetime.datetime.now()} - "Error: {e}{colors.get("reset")}')
     
 
-    ### CONFIGURE HA ###
-    try:
-
-        response_ha = requests.get(fmc_devices, headers=headers, verify=False)
-        response_ha.raise_for_status() 
-        devices = response_ha.json() # Get the first page of devices
-        temp_devices_list = devices.get('items', []) # Get the list of devices
-        for id in temp_devices_list:
-            device_name = id['name'] # Get the name of each device
-            device_id = id['id'] # Get the ID of each device
-            response_int = requests.get(fmc_dev_int_url.format(device_id=device_id), headers=headers, verify=False)
-            response_int.raise_for_status()
-            temp_devices_interface = response_int.json().get('items', [])
-            for interface in temp_devices_interface:
-                if interface['name'] == 'GigabitEthernet0/5':
-                    interface_id = interface['id'] # Get the ID of each device interface
+        # Security zones and the route objects do not depend on the HA pair, so submit them
+        # now and let them run while the HA block below waits on FMC; their results are
+        # read (and reported) on this thread in the sections further down
+        zones_payload = sec_zone_settings["sec_zones_payload"]
+        host_object = fmc_route_settings["host_object"]
+        background = ThreadPoolExecutor(max_workers=max(1, min(8, len(zones_payload) + 2)))
+        zone_futures = [background.submit(session.post, fmc_sec_zones_url, data=orjson.dumps(zone)) for zone in zones_payload]
+        host_future = background.submit(session.post, fmc_obj_host_url, data=orjson.dumps(host_object))
+        networks_future = background.submit(session.get, fmc_obj_network_url)
+
+        ### CONFIGURE HA ###
+        try:
+
+            # Reuse the records collected by the readiness poll instead of re-listing devices;
+            # only the two HA members need their interfaces, in payload order because the
+            # HA payload treats devices_list[0] as primary
+            temp_devices_list = [ready_devices[name] for name in device_names if name in ready_devices][:2]
+            with ThreadPoolExecutor(max_workers=max(1, min(8, len(temp_devices_list)))) as executor:
+                futures = [executor.submit(get_filtered, fmc_dev_int_url.format(device_id=id['id']), ['GigabitEthernet0/5']) for id in temp_devices_list]
+                interface_listings = [future.result() for future in futures]
+            for id, interface_listing in zip(temp_devices_list, interface_listings):
+                device_name = id['name'] # Get the name of each device
+                device_id = id['id'] # Get the ID of each device
+                temp_devices_interface = interface_listing['items']
+                if_by_name = {interface['name']: interface for interface in temp_devices_interface}
+                gi05 = if_by_name.get('GigabitEthernet0/5')
+                if gi05:
+                    interface_id = gi05['id'] # Get the ID of each device interface
                     devices_list.append({"name": device_name, "id": device_id, "interface_id": interface_id}) # Append the device ID to the list
-
-        ha_payload = ha_settings["ha_payload"]
-        ha_payload["primary"]["id"] = devices_list[0]["id"]
-        ha_payload["primary"]["name"] = devices_list[0]["name"]
-        ha_payload["secondary"]["id"] = devices_list[1]["id"]
-        ha_payload["secondary"]["name"] = devices_list[1]["name"]
-        ha_payload["ftdHABootstrap"]["lanFailover"]["interfaceObject"]["id"] = devices_list[0]["interface_id"]
-        ha_payload["ftdHABootstrap"]["statefulFailover"]["interfaceObject"]["id"] = devices_list[1]["interface_id"]
-        response_post = requests.post(fmc_ha_settings_url, headers=headers, data=json.dumps(ha_payload), verify=False)
-        time.sleep(10)
-        # Poll until the new HA pair appears in the list
-        ha_id = ""
-        max_ha_wait = 1800
-        wait_ha = 0
-        while not ha_id:
-            response_no_ha_id = requests.get(fmc_ha_settings_url, headers=headers, verify=False)
-            response_no_ha_id.raise_for_status()
-            ha_pairs = response_no_ha_id.json().get('items', [])
-            for ha in ha_pairs:
-                if ha.get('name') == ha_payload['name']:
-                    ha_id = ha.get('id')
-                    logger.info(f'HA pair found: {ha_id}')
-                    break
-            if not ha_id:
-                if wait_ha > max_ha_wait:
-                    logger.info("Timeout waiting for HA pair to appear.")
-                    return
-                logger.info(f"Waiting for HA pair to be created... ({wait_ha}s)")
-                time.sleep(poll_interval)
-                wait_ha += poll_interval
-        if ha_id:
-            while True:
-                response_ha_id = requests.get(fmc_ha_check_url.format(ha_id=ha_id), headers=headers, verify=False)
-                response_ha_id.raise_for_status()
-                ha_json = response_ha_id.json()
-                meta = ha_json.get('metadata', {})
+            if len(devices_list) < 2:
+                raise InvalidDataError(f"HA needs two ready devices with GigabitEthernet0/5, found {len(devices_list)}. Skipping HA configuration.")
+
+            ha_payload = ha_settings["ha_payload"]
+            ha_payload["primary"]["id"] = devices_list[0]["id"]
+            ha_payload["primary"]["name"] = devices_list[0]["name"]
+            ha_payload["secondary"]["id"] = devices_list[1]["id"]
+            ha_payload["secondary"]["name"] = devices_list[1]["name"]
+            ha_payload["ftdHABootstrap"]["lanFailover"]["interfaceObject"]["id"] = devices_list[0]["interface_id"]
+            ha_payload["ftdHABootstrap"]["statefulFailover"]["interfaceObject"]["id"] = devices_list[1]["interface_id"]
+            response_post = session.post(fmc_ha_settings_url, data=orjson.dumps(ha_payload))
+            # Poll until the new HA pair appears in the list
+            max_ha_wait = 1800
+
+            def find_ha_id(body):
+                return next((ha.get('id') for ha in body.get('items', []) if ha.get('name') == ha_payload['name']), "")
+
+            try:
+                ha_pairs = _poll(
+                    lambda: _get_json(session, fmc_ha_settings_url),
+                    find_ha_id,
+                    max_ha_wait,
+                    base=poll_interval / 2,
+                    label="HA pair to be created"
+                )
+            except TimeoutError:
+                # Not a return: the zones and objects already submitted still get reported below
+                raise InvalidDataError("Timeout waiting for HA pair to appear.")
+            ha_id = find_ha_id(ha_pairs)
+            logger.info(f'HA pair found: {ha_id}')
+
+            def ha_statuses(body):
+                meta = body.get('metadata', {})
                 primary_status = meta.get('primaryStatus', {}).get('currentStatus', '').lower()
                 secondary_status = meta.get('secondaryStatus', {}).get('currentStatus', '').lower()
+                return primary_status, secondary_status
+
+            def ha_settled(body):
+                primary_status, secondary_status = ha_statuses(body)
                 logger.info(f"HA status: primary={primary_status}, secondary={secondary_status}")
-                if primary_status == "active" and secondary_status == "standby":
+                return (primary_status == "active" and secondary_status == "standby") or "failed" in (primary_status, secondary_status)
+
+            try:
+                ha_json = _poll(
+                    lambda: _get_json(session, fmc_ha_check_url.format(ha_id=ha_id)),
+                    ha_settled,
+                    max_ha_wait,
+                    base=poll_interval / 2,
+                    progress_fn=ha_statuses,
+                    label="HA to establish"
+                )
+                if ha_statuses(ha_json) == ("active", "standby"):
+                    primary_device = ha_json["metadata"]["primaryStatus"]["device"]
+                    primary_status_id = primary_device["id"]
+                    primary_name = primary_device["name"]
+                    logger.info(f'Active device is {primary_name}')
                     logger.info("HA added successfully.")
                     fmc_ha_progress.update(1)
-                    fmc_ha_queue.put(f"{datetime.datetime.now() } HA added successfully.")
-                    break
-                if primary_status == "failed" or secondary_status == "failed":
+                    put_ok(fmc_ha_queue, "HA added successfully.")
+                else:
                     logger.info("HA failed - Please check logs.")
-                    break
-                if wait_ha > max_ha_wait:
-                    logger.info(f"Warning: HA taking too long to establish. Waited {wait_ha} seconds.")
-                    break
-                logger.info(f"Waiting... ({wait_ha}s)")
-                time.sleep(poll_interval)
-                wait_ha += poll_interval
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error: {e}")
-        fmc_ha_queue.put(f'{colors.get("red")}{datetime.datetime.now()} - "Error: {e}{colors.get("reset")}')
+            except TimeoutError as e:
+                logger.info(f"Warning: HA taking too long to establish. {e}")
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error: {e}")
+            put_error(fmc_ha_queue, f"Error: {e}")
+        except InvalidDataError as e:
+            logger.error(f"Error: {e}")
+            put_error(fmc_ha_queue, f"Error: {e}")
     
-    ### CREATE SECURITY ZONES ###
-
-    try:
-        zones_id_list = []
-        for zone in sec_zone_settings["sec_zones_payload"]:
-            response_zones = requests.post(fmc_sec_zones_url, headers=headers, data=json.dumps(zone), verify=False)
-            response_zones.raise_for_status()
-            zones = response_zones.json()
-            zones_id = zones.get('id')
-            zones_id_list.append(zones_id)
-
-            if response_zones.status_code in [200, 201]:
-                fmc_sec_zones_queue.put(f"{datetime.datetime.now() } Security zone {zone['name']} created successfully.")
-                logger.info(f"Security zone {zone['name']} created successfully.")
-                fmc_seczone_progress.update(1)
-            else:
-                logger.info(f"Failed to create security zone {zone['name']}. Status code: {response_zones.status_code}")
-                logger.info(response_zones.text)
-      #  fmc_seczone_progress.close()
-        time.sleep(5)
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error: {e}")
-        fmc_sec_zones_queue.put(f'{colors.get("red")}{datetime.datetime.now()} - "Error: {e}{colors.get("reset")}')     
+        ### CREATE SECURITY ZONES ###
+
+        try:
+            zones_id_list = []
+            # Futures are read in payload order so zones_id_list[zone_index] still points at
+            # the right zone
+            zone_responses = [future.result() for future in zone_futures]
+            for zone, response_zones in zip(zones_payload, zone_responses):
+                response_zones.raise_for_status()
+                zones = response_zones.json()
+                zones_id = zones.get('id')
+                zones_id_list.append(zones_id)
+
+                if response_zones.status_code in [200, 201]:
+                    put_ok(fmc_sec_zones_queue, f"Security zone {zone['name']} created successfully.")
+                    logger.info(f"Security zone {zone['name']} created successfully.")
+                    fmc_seczone_progress.update(1)
+                else:
+                    logger.info(f"Failed to create security zone {zone['name']}. Status code: {response_zones.status_code}")
+                    logger.info(response_zones.text)
+          #  fmc_seczone_progress.close()
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error: {e}")
+            put_error(fmc_sec_zones_queue, f"Error: {e}")
     
-    ### CONFIGURE INTERFACES ###
-    try:
-    # Get the HA primary device ID
-        def configure_interface(
-            interface_id,
-            interface_name,
-            config,  # dict from your external config, includes zone_index
-            zones_id_list,
-            primary_status_id,
-            primary_name,
-            headers,
-            fmc_interface_progress,
-            fmc_interface_queue
-        ):
-            """
-            Helper to configure a single interface on the FMC device using external config.
-            """
-
-            response_int = requests.get(fmc_url_devcies_int_detail.format(primary_status_id=primary_status_id,interface_id=interface_id), headers=headers, verify=False)
-            response_int.raise_for_status()
-            interface_obj = response_int.json()
-            interface_obj.pop("links", None)
-            interface_obj.pop("metadata", None)
-            # Use zone_index from config to select the correct security zone
-            zone_index = config["zone_index"]
-            interface_obj["securityZone"] = {
-                "id": zones_id_list[zone_index],
-                "type": "SecurityZone"
-            }
-            interface_obj["ifname"] = config["ifname"]
-            interface_obj["enabled"] = True
-            interface_obj["ipv4"] = {
-                "static": {
-                    "address": config["ip_address"],
-                    "netmask": config["netmask"]
+        ### CONFIGURE INTERFACES ###
+        try:
+        # Get the HA primary device ID
+            def fetch_interface(interface_id, primary_status_id):
+                """
+                Helper to GET a single interface from the FMC device, stripped of read-only fields.
+                """
+                response_int = session.get(fmc_url_devcies_int_detail.format(primary_status_id=primary_status_id,interface_id=interface_id))
+                response_int.raise_for_status()
+                interface_obj = response_int.json()
+                interface_obj.pop("links", None)
+                interface_obj.pop("metadata", None)
+                return interface_obj
+
+            def apply_interface_config(
+                interface_obj,
+                config,  # dict from your external config, includes zone_index
+                zones_id_list
+            ):
+                """
+                Helper to apply the external config (zone, ifname, IP) to an interface object in memory.
+                """
+                # Use zone_index from config to select the correct security zone
+                zone_index = config["zone_index"]
+                interface_obj["securityZone"] = {
+                    "id": zones_id_list[zone_index],
+                    "type": "SecurityZone"
+                }
+                interface_obj["ifname"] = config["ifname"]
+                interface_obj["enabled"] = True
+                interface_obj["ipv4"] = {
+                    "static": {
+                        "address": config["ip_address"],
+                        "netmask": config["netmask"]
+                    }
+                }
+                return interface_obj
+
+            def compact_interface(interface_obj):
+                """
+                Helper to reduce a configured interface object to the fields the PUT changes.
+                """
+                return {
+                    "type": interface_obj["type"],
+                    "id": interface_obj["id"],
+                    "name": interface_obj["name"],
+                    "mode": interface_obj.get("mode", "NONE"),
+                    "MTU": interface_obj.get("MTU", 1500),
+                    "ifname": interface_obj["ifname"],
+                    "enabled": interface_obj["enabled"],
+                    "securityZone": interface_obj["securityZone"],
+                    "ipv4": interface_obj["ipv4"]
                 }
-            }
-            response_put = requests.put(fmc_url_devcies_int_detail.format(primary_status_id=primary_status_id,interface_id=interface_id), headers=headers, data=json.dumps(interface_obj), verify=False)
-            response_put.raise_for_status()
-            if response_put.status_code in [200, 201]:
-                logger.info(f"Security zone assigned to interface {interface_name} on device {primary_name} successfully.")
-                fmc_interface_queue.put(f"{datetime.datetime.now()} Security zone assigned to interface {interface_name} on device {primary_name} successfully.")
-                logger.info(f'IP address assigned to interface {interface_name} on device {primary_name} successfully.')
-                fmc_interface_queue.put(f"{datetime.datetime.now()} IP address assigned to interface {interface_name} on device {primary_name} successfully.")
-                fmc_interface_progress.update(1)
-            else:
-                logger.info(f"Failed to assign security zone to interface {interface_name} on device {primary_name}. Status code: {response_put.status_code}")
-                logger.info(response_put.text)
-
-        response_ha_check = requests.get(fmc_ha_check_url.format(ha_id=ha_id), headers=headers, verify=False)
-        response_ha_check.raise_for_status()
-        ha_json = response_ha_check.json()
-        logger.info(f'Active device is {ha_json["metadata"]["primaryStatus"]["device"]["name"]}')
-        logger.info(response_ha_check.text)
-        primary_status_id = ha_json["metadata"]["primaryStatus"]["device"]["id"]
-        primary_name = ha_json["metadata"]["primaryStatus"]["device"]["name"]
-        url_devices_int = f"https://192.168.0.201/api/fmc_config/v1/domain/default/devices/devicerecords/{primary_status_id}/physicalinterfaces"
-        response_int_check = requests.get(url_devices_int, headers=headers, verify=False)
-        response_int_check.raise_for_status()
-        interfaces = response_int_check.json().get('items', [])
-
-        for int_id in interfaces:
-            int_name = int_id['name']
-            if int_name  in fmc_int_settings:
-                config = fmc_int_settings[int_name]
-                configure_interface(
-                    interface_id=int_id['id'],
-                    interface_name=int_name,
-                    config=config,
-                    zones_id_list=zones_id_list,
-                    primary_status_id=primary_status_id,
-                    primary_name=primary_name,
-                    headers=headers,
-                    fmc_interface_progress=fmc_interface_progress,
-                    fmc_interface_queue=fmc_interface_queue,
-                )
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error: {e}")
-        fmc_interface_queue.put(f'{colors.get("red")}{datetime.datetime.now()} - "Error: {e}{colors.get("reset")}') 
-        
-    ### CREATE DEFAULT ROUTE ###
 
-    try:
-        host_object = fmc_route_settings["host_object"]
-        static_route_payload = fmc_route_settings["static_route_payload"]
-
-        # Create network object:
-        response_post = requests.post(fmc_obj_host_url, headers=headers, data=json.dumps(host_object), verify=False)
-        obj_creation_re = response_post.json()
-        logger.info(response_post.status_code)
-        if response_post.status_code in [200,201]:            
-            gw_host_id = obj_creation_re.get('id')
-            static_route_payload["gateway"]["object"]["id"] = gw_host_id
-            logger.info(f"Host object {host_object['name']} created successfully.")
-            logger.info(f"Host object ID: {gw_host_id}")
-            fmc_host_obj_progress.update(1)
-            fmc_object_host_queue.put(f"{datetime.datetime.now() } Host object {host_object['name']} created successfully.")
-        else:
-            logger.info(f"Failed to create host object {host_object['name']}. Status code: {response_post.status_code}")
-            logger.info(response_post.text)
-
-        # Get any IPv4 object ID
-        response_get = requests.get(fmc_obj_network_url, headers=headers, verify=False)
-        response_get.raise_for_status()
-        obj_networks_all = response_get.json().get('items', [])
-
-        for obj in obj_networks_all:
-            if obj['name'] == 'any-ipv4':
-                any_ipv4_id = obj['id']
-
-        static_route_payload["selectedNetworks"][0]["id"] = any_ipv4_id
-        # Create route
-        response_route = requests.post(fmc_routing_url.format(primary_status_id=primary_status_id), headers=headers, data=json.dumps(static_route_payload), verify=False)
-        response_route.raise_for_status()
-
-        if response_route.status_code in [200, 201]:
-            route_response = response_route.json()
-            logger.info(f"Static route '{static_route_payload['name']}' created successfully.")
-            logger.info(f"Route ID: {route_response.get('id')}")
-            fmc_route_progress.update(1)
-            fmc_route_queue.put(f"{datetime.datetime.now() } Static route '{static_route_payload['name']}' created successfully.")
-        else:
-            logger.info(f"Failed to create static route. Status code: {response_route.status_code}")
-            logger.info(response_route.text)
-
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error: {e}")
-        fmc_interface_queue.put(f'{colors.get("red")}{datetime.datetime.now()} - "Error: {e}{colors.get("reset")}')
-    try:
-        # Close progress bars
-        fmc_register_progress.close()
-        fmc_ha_progress.close() 
-        fmc_seczone_progress.close()
-        fmc_interface_progress.close()
-        fmc_host_obj_progress.close()
-        fmc_route_progress.close()
-    except:
-        pass  # In case any are already closed
\ No newline at end of file
+            def put_interface(interface_id, interface_obj, primary_status_id):
+                """
+                Helper to PUT a configured interface back to the FMC device. Sends the compact
+                payload first and falls back to the full object if FMC rejects it.
+                """
+                url = fmc_url_devcies_int_detail.format(primary_status_id=primary_status_id,interface_id=interface_id)
+                response_put = session.put(url, data=orjson.dumps(compact_interface(interface_obj)))
+                if response_put.status_code == 400:
+                    logger.info(f"FMC rejected compact payload for interface {interface_obj['name']}, sending full object.")
+                    response_put = session.put(url, data=orjson.dumps(interface_obj))
+                return response_put
+
+            if not primary_status_id:
+                raise InvalidDataError("HA primary device not available, skipping interface configuration.")
+            interfaces = get_filtered(fmc_dev_int_url.format(device_id=primary_status_id), fmc_int_settings)['items']
+
+            target_interfaces = [int_id for int_id in interfaces if int_id['name'] in fmc_int_settings]
+            # Fan out the GETs, configure in memory, then fan out the PUTs; progress and
+            # queue updates stay on this thread to keep tqdm off the worker threads
+            with ThreadPoolExecutor(max_workers=max(1, min(8, len(target_interfaces)))) as executor:
+                interface_objs = list(executor.map(lambda int_id: fetch_interface(int_id['id'], primary_status_id), target_interfaces))
+                for int_id, interface_obj in zip(target_interfaces, interface_objs):
+                    apply_interface_config(interface_obj, fmc_int_settings[int_id['name']], zones_id_list)
+                put_responses = list(executor.map(
+                    lambda item: put_interface(item[0]['id'], item[1], primary_status_id),
+                    zip(target_interfaces, interface_objs)
+                ))
+            for int_id, response_put in zip(target_interfaces, put_responses):
+                interface_name = int_id['name']
+                response_put.raise_for_status()
+                if response_put.status_code in [200, 201]:
+                    logger.info(f"Security zone assigned to interface {interface_name} on device {primary_name} successfully.")
+                    put_ok(fmc_interface_queue, f"Security zone assigned to interface {interface_name} on device {primary_name} successfully.")
+                    logger.info(f'IP address assigned to interface {interface_name} on device {primary_name} successfully.')
+                    put_ok(fmc_interface_queue, f"IP address assigned to interface {interface_name} on device {primary_name} successfully.")
+                    fmc_interface_progress.update(1)
+                else:
+                    logger.info(f"Failed to assign security zone to interface {interface_name} on device {primary_name}. Status code: {response_put.status_code}")
+                    logger.info(response_put.text)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error: {e}")
+            put_error(fmc_interface_queue, f"Error: {e}")
+        except InvalidDataError as e:
+            logger.error(f"Error: {e}")
+            put_error(fmc_interface_queue, f"Error: {e}")
+        
+        ### CREATE DEFAULT ROUTE ###
+
+        try:
+            static_route_payload = fmc_route_settings["static_route_payload"]
+
+            # Create network object (submitted before the HA block):
+            response_post = host_future.result()
+            obj_creation_re = response_post.json()
+            logger.info(response_post.status_code)
+            if response_post.status_code in [200,201]:            
+                gw_host_id = obj_creation_re.get('id')
+                static_route_payload["gateway"]["object"]["id"] = gw_host_id
+                logger.info(f"Host object {host_object['name']} created successfully.")
+                logger.info(f"Host object ID: {gw_host_id}")
+                fmc_host_obj_progress.update(1)
+                put_ok(fmc_object_host_queue, f"Host object {host_object['name']} created successfully.")
+            else:
+                logger.info(f"Failed to create host object {host_object['name']}. Status code: {response_post.status_code}")
+                logger.info(response_post.text)
+
+            # Get any IPv4 object ID
+            response_get = networks_future.result()
+            response_get.raise_for_status()
+            obj_networks_all = response_get.json().get('items', [])
+
+            networks_by_name = {obj['name']: obj['id'] for obj in obj_networks_all}
+            any_ipv4_id = networks_by_name.get('any-ipv4')
+            if not any_ipv4_id:
+                raise InvalidDataError("Network object 'any-ipv4' not found on FMC.")
+
+            static_route_payload["selectedNetworks"][0]["id"] = any_ipv4_id
+            if not primary_status_id:
+                raise InvalidDataError("HA primary device not available, skipping default route.")
+            # Create route
+            response_route = session.post(fmc_routing_url.format(primary_status_id=primary_status_id), data=orjson.dumps(static_route_payload))
+            response_route.raise_for_status()
+
+            if response_route.status_code in [200, 201]:
+                route_response = response_route.json()
+                logger.info(f"Static route '{static_route_payload['name']}' created successfully.")
+                logger.info(f"Route ID: {route_response.get('id')}")
+                fmc_route_progress.update(1)
+                put_ok(fmc_route_queue, f"Static route '{static_route_payload['name']}' created successfully.")
+            else:
+                logger.info(f"Failed to create static route. Status code: {response_route.status_code}")
+                logger.info(response_route.text)
+
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error: {e}")
+            put_error(fmc_interface_queue, f"Error: {e}")
+        except InvalidDataError as e:
+            logger.error(f"Error: {e}")
+            put_error(fmc_route_queue, f"Error: {e}")
+    finally:
+        try:
+            # Close progress bars
+            fmc_register_progress.close()
+            fmc_ha_progress.close() 
+            fmc_seczone_progress.close()
+            fmc_interface_progress.close()
+            fmc_host_obj_progress.close()
+            fmc_route_progress.close()
+        except:
+            pass  # In case any are already closed
+        if background is not None:
+            background.shutdown(wait=True)
+        session.close()
@@ -1,12 +1,51 @@
-import json
-import pandas as pd # Data manipulation library
+import builtins # The builtin FileNotFoundError is shadowed by exceptions_ftd's
+import orjson # Fast JSON parsing for the configuration and payload files
 from exceptions_ftd import FileNotFoundError, InvalidConfigurationError, InvalidDataError
-import pyfiglet # ASCII art library
 import logging
+from functools import lru_cache
+from typing import NamedTuple
 
 logger = logging.getLogger()
 
 
+class AutomationConfig(NamedTuple):
+    """
+    Configuration and payloads loaded by file_path().
+    Being a NamedTuple, it has no per-instance __dict__ and still unpacks like the
+    tuple file_path() used to return.
+    """
+    fmc_creds_payload: list # FMC API credentials
+    fmc_token_api: str # url to generate token
+    fmc_policyid_url: str # url to get policy id
+    fmc_devices_payload: dict # device registration payload
+    fmc_devices_api: str # url to register devices
+    dev_detail_url_api: str # url to get device details
+
+
+def _load_json(path, description):
+    """
+    Load a JSON file, mapping failures to the automation's exceptions.
+    Args:
+        path (str): Path of the JSON file.
+        description (str): Name of the file used in error messages.
+    Returns:
+        dict: The parsed JSON content.
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        InvalidConfigurationError: If the file is not valid JSON.
+        OSError: If the file exists but cannot be read (permissions, directory, I/O).
+    """
+    try:
+        with open(path, 'rb') as file:
+            return orjson.loads(file.read())
+    except builtins.FileNotFoundError:
+        logger.error(f"The {description} file '{path}' was not found.")
+        raise FileNotFoundError(f"The {description} file '{path}' was not found.")
+    except orjson.JSONDecodeError:
+        logger.error(f"The {description} file '{path}' is invalid or malformed.")
+        raise InvalidConfigurationError(f"The {description} file '{path}' is invalid or malformed.")
+
+
 def file_path():
 
     """
@@ -27,11 +66,9 @@ def file_path():
         None
 
     Returns:
-        tuple: A tuple containing all loaded and validated data, including:
-            - Device credentials and payloads
-            - FTD and FMC configuration file paths
-            - API URLs and headers
-            - HA and security zone settings
+        AutomationConfig: All loaded and validated data, including:
+            - FMC credentials
+            - FMC API URLs
             - FMC device registration payloads
 
     Raises:
@@ -40,64 +77,65 @@ def file_path():
         InvalidDataError: If required data is missing or invalid in the Excel files.
     """
 
-    try:
-        # Open the configuration file
-        with open('/home/user/pystudies/myenv/pythonbasic/projects/FTD_automation_deploy/data/automation_urls_ftd.json', 'r') as config_file:
-            files_path = json.load(config_file)
-
-            # FMC parameters
-            ##FILES:
-            fmc_creds = files_path["payload"]["fmc_creds_payload"] #file with FMC credentials
-            fmc_devices = files_path["payload"]["fmc_devices_payload"]
-            
-            ##URLS
-            fmc_token_api = files_path["fmc_api"]["fmc_token_api"] #url to generate token
-            fmc_policyid_url = files_path["fmc_api"]["url_policyid_api"]# url to get policy id
-            fmc_devices_api = files_path["fmc_api"]["fmc_devices_api"] #url to register devices
-            dev_detail_url_api = files_path["fmc_api"]["dev_detail_url_api"] #url to get device details
-            # fmc_devices = files_path["fmc_api"]["fmc_devices"]
-            # fmc_data = files_path["urls"]["fmc_payload"]
-            # fmc_ha_payload = files_path["urls"]["ha_payload"]
-            # fmc_sec_zones_payload = files_path["urls"]["fmc_sec_zones"]
-            # fmc_interface_payload = files_path["urls"]["fmc_int_payload"]
-            # fmc_route_payload = files_path["urls"]["fmc_route_payload"]
-            # fmc_device_details_url = files_path["fmc_api"]["dev_detail_url"]
-            # fmc_ha_settings_url = files_path["fmc_api"]["ha_settings_url"]
-            # fmc_sec_zones_url = files_path["fmc_api"]["sec_zones"]
-            # fmc_url_devcies_int_detail = files_path["fmc_api"]["url_devices_int_det"]
-            # fmc_obj_network_url = files_path["fmc_api"]["object_network"]
-            # fmc_obj_host_url = files_path["fmc_api"]["object_host"]
-            # fmc_routing_url = files_path["fmc_api"]["routing"]
-            # fmc_dev_int_url = files_path["fmc_api"]["url_devices_int"]
-            # fmc_ha_check_url = files_path["fmc_api"]["ha_check_url"]
-
-    except FileNotFoundError:
-        logger.error("The configuration file 'automation_urls.json' was not found.")
-        raise FileNotFoundError("The configuration file 'automation_urls.json' was not found.")
-        
-    except json.JSONDecodeError:
-        logger.error("The configuration file 'automation_urls.json' is invalid or malformed.")
-        raise InvalidConfigurationError("The configuration file 'automation_urls.json' is invalid or malformed.")
-        
+    # Open the configuration file
+    files_path = _load_json('/home/user/pystudies/myenv/pythonbasic/projects/FTD_automation_deploy/data/automation_urls_ftd.json', "configuration")
 
-    try:
-        # Open the JSON files with devices ha payload
-        with open(fmc_creds,'r') as file_0, \
-            open(fmc_devices,'r') as file_1:
-            fmc_creds_payload = json.load(file_0)
-            fmc_devices_payload = json.load(file_1)
-    except FileNotFoundError:
-        raise FileNotFoundError(f" file not found: {files_path}")
-    except json.JSONDecodeError:
-        raise ValueError(f"Invalid XML in file: {files_path}")
-
-
-    return fmc_creds_payload, \
-        fmc_token_api, \
-        fmc_policyid_url, \
-        fmc_devices_payload, \
-        fmc_devices_api, \
-        dev_detail_url_api
+    # FMC parameters
+    ##FILES:
+    payload_files = {
+        "fmc_creds_payload": files_path["payload"]["fmc_creds_payload"], #file with FMC credentials
+        "fmc_devices_payload": files_path["payload"]["fmc_devices_payload"]
+    }
+
+    ##URLS
+    fmc_token_api = files_path["fmc_api"]["fmc_token_api"] #url to generate token
+    fmc_policyid_url = files_path["fmc_api"]["url_policyid_api"]# url to get policy id
+    fmc_devices_api = files_path["fmc_api"]["fmc_devices_api"] #url to register devices
+    dev_detail_url_api = files_path["fmc_api"]["dev_detail_url_api"] #url to get device details
+    # fmc_devices = files_path["fmc_api"]["fmc_devices"]
+    # fmc_data = files_path["urls"]["fmc_payload"]
+    # fmc_ha_payload = files_path["urls"]["ha_payload"]
+    # fmc_sec_zones_payload = files_path["urls"]["fmc_sec_zones"]
+    # fmc_interface_payload = files_path["urls"]["fmc_int_payload"]
+    # fmc_route_payload = files_path["urls"]["fmc_route_payload"]
+    # fmc_device_details_url = files_path["fmc_api"]["dev_detail_url"]
+    # fmc_ha_settings_url = files_path["fmc_api"]["ha_settings_url"]
+    # fmc_sec_zones_url = files_path["fmc_api"]["sec_zones"]
+    # fmc_url_devcies_int_detail = files_path["fmc_api"]["url_devices_int_det"]
+    # fmc_obj_network_url = files_path["fmc_api"]["object_network"]
+    # fmc_obj_host_url = files_path["fmc_api"]["object_host"]
+    # fmc_routing_url = files_path["fmc_api"]["routing"]
+    # fmc_dev_int_url = files_path["fmc_api"]["url_devices_int"]
+    # fmc_ha_check_url = files_path["fmc_api"]["ha_check_url"]
+
+    # Load every payload file the same way
+    payloads = {name: _load_json(path, name) for name, path in payload_files.items()}
+    fmc_creds_payload = payloads["fmc_creds_payload"]
+    fmc_devices_payload = payloads["fmc_devices_payload"]
+
+    return AutomationConfig(
+        fmc_creds_payload=fmc_creds_payload,
+        fmc_token_api=fmc_token_api,
+        fmc_policyid_url=fmc_policyid_url,
+        fmc_devices_payload=fmc_devices_payload,
+        fmc_devices_api=fmc_devices_api,
+        dev_detail_url_api=dev_detail_url_api
+    )
+
+@lru_cache(maxsize=1)
+def _banner_lines():
+    """
+    Render the ASCII art banner once and cache it.
+    Returns:
+        tuple: The banner lines and the inner width of the surrounding square.
+    """
+    import pyfiglet # ASCII art library, imported on first use to keep module import light
+    # Generate smaller ASCII art using the "univers" font
+    ascii_lines = tuple(pyfiglet.figlet_format("! BoUnCeR *", font="standard").splitlines())
+    # Determine the width of the square
+    max_width = max(len(line) for line in ascii_lines)  # Find the widest line in the ASCII art
+    square_width = max(max_width, 50)  # Ensure the square is at least 50 characters wide
+    return ascii_lines, square_width
 
 def display_message(colors):
     """
@@ -107,43 +145,37 @@ def display_message(colors):
     Returns:
         str: The formatted message with ASCII art and additional information.
     """  
-    # Generate smaller ASCII art using the "univers" font
-    ascii_art = pyfiglet.figlet_format("! BoUnCeR *", font="standard")
-    ascii_lines = ascii_art.splitlines()  # Split the ASCII art into lines
-
-    # Determine the width of the square
-    max_width = max(len(line) for line in ascii_lines)  # Find the widest line in the ASCII art
-    square_width = max(max_width, 50)  # Ensure the square is at least 50 characters wide
+    # The figlet rendering does not depend on colors, so it is cached
+    ascii_lines, square_width = _banner_lines()
 
-    # Create the top border of the square
-    message = f"{colors.get('blue')}" + "#" * (square_width + 4) + "\n"
+    border = "#" * (square_width + 4)
+    pad = f"# {''.ljust(square_width)} #" # Empty padding line
 
-    # Add empty padding lines
-    message += f"# {''.ljust(square_width)} #\n" * 2
+    # Collect the lines and join them once instead of growing a string
+    parts = [f"{colors.get('blue')}{border}"] # Top border of the square
+    parts += [pad] * 2
 
     # Add the ASCII art inside the square
-    for line in ascii_lines:
-        message += f"# {line.ljust(square_width)} #\n"
+    parts += [f"# {line.ljust(square_width)} #" for line in ascii_lines]
 
     # Add the additional message and center it
     additional_message = "Eve-ng Cisco FTD Firewall automated \n deployment using Python"
-    for line in additional_message.split("\n"):
-        message += f"# {line.center(square_width)} #\n"
+    parts += [f"# {line.center(square_width)} #" for line in additional_message.split("\n")]
 
     # Add more empty padding lines
-    message += f"# {''.ljust(square_width)} #\n" * 2
+    parts += [pad] * 2
 
     # Add the GitHub profile and center it
     github_line = "GitHub Profile:  https://github.com/jotape75"
-    message += f"# {colors.get('green')}{github_line.center(square_width)}{colors.get('reset')}{colors.get('blue')} #\n"
+    parts.append(f"# {colors.get('green')}{github_line.center(square_width)}{colors.get('reset')}{colors.get('blue')} #")
 
     # Add more empty padding lines
-    message += f"# {colors.get('blue')}{''.ljust(square_width)} #\n" * 2
+    parts += [f"# {colors.get('blue')}{''.ljust(square_width)} #"] * 2
 
     # Create the bottom border of the square
-    message += "#" * (square_width + 4) + f"{colors.get('reset')}\n"
+    parts.append(f"{border}{colors.get('reset')}")
 
-    return message
+    return "\n".join(parts) + "\n"
 
 def color_text():
     """
@@ -13,7 +13,7 @@ Functions:
     - Demonstrates various FMC REST API endpoints for device management
     - Performs GET requests to retrieve configuration data
     - Handles SSL verification bypass for lab environments
-    - Pretty-prints JSON responses for analysis
+    - Logs each endpoint's status; pretty-prints JSON responses with -v
 
 API Endpoints Demonstrated:
 ---------------------------
@@ -30,7 +30,7 @@ API Endpoints Demonstrated:
 Dependencies:
 -------------
 - requests: For HTTP/HTTPS API communication
-- json: For JSON data parsing and formatting
+- orjson: For JSON data parsing and formatting
 - urllib3: For SSL warning suppression (disabled for lab environments)
 
 Configuration:
@@ -48,6 +48,8 @@ Usage:
 ------
 Run the script directly to test FMC API connectivity and retrieve configuration data:
     python fmc_api_gather_info.py
+Add -v to also pretty-print every response body:
+    python fmc_api_gather_info.py -v
 
 Security Notes:
 ---------------
@@ -64,8 +66,103 @@ This script is designed for lab environments and API testing. For production use
 - Add comprehensive error handling and retry logic
 """
 
+import argparse
+import logging
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson # Fast JSON decoding and pretty-printing
+import time
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+log = logging.getLogger(__name__)
+
+# Upper bound on in-flight FMC requests; FMC rate-limits its REST API and caps
+# concurrent sessions per user, so the fan-out never exceeds this
+MAX_CONCURRENCY = 8
+# FMC tokens are valid for 30 minutes; saved ones are reused across runs for 25
+TOKEN_FILE = os.path.expanduser("~/.cache/fmc_token.json")
+TOKEN_TTL = 25 * 60
+
+
+def get_json(session, url, **kwargs):
+    """
+    GET an FMC endpoint and return its status code with the decoded body.
+
+    Args:
+        session (requests.Session): Session used for the request.
+        url (str): Endpoint to fetch.
+        **kwargs: Passed to the GET request.
+
+    Returns:
+        tuple: (status_code, body) with the parsed JSON body, or the raw text on errors.
+    """
+    response = session.get(url, **kwargs)
+    if not response.ok:
+        return response.status_code, response.text
+    try:
+        return response.status_code, orjson.loads(response.content)
+    except orjson.JSONDecodeError:
+        return response.status_code, response.text
+
+
+FMC = "https://192.168.0.201/api/fmc_config/v1/domain/default"
+# Endpoint name -> URL template; placeholders are filled once per run by build_endpoints
+ENDPOINT_TEMPLATES = {
+    "devices": f"{FMC}/devices/devicerecords",
+    "device_detail": f"{FMC}/devices/devicerecords/{{device_id}}",
+    "ha_pairs": f"{FMC}/devicehapairs/ftddevicehapairs",
+    "ha_check": f"{FMC}/devicehapairs/ftddevicehapairs/{{ha_id}}",
+    "interfaces": f"{FMC}/devices/devicerecords/{{device_id}}/physicalinterfaces",
+    "interface_detail": f"{FMC}/devices/devicerecords/{{device_id}}/physicalinterfaces/{{interface_id}}",
+    "security_zones": f"{FMC}/object/securityzones",
+    "static_routes": f"{FMC}/devices/devicerecords/{{device_id}}/routing/staticroutes",
+    "static_route_detail": f"{FMC}/devices/devicerecords/{{device_id}}/routing/ipv4staticroutes/{{statiroute_id}}",
+    "network_objects": f"{FMC}/object/networks",
+    "deployments": "https://192.168.0.201/api/fmc_config/v1/domain/e276abec-e0f2-11e3-8169-6d9ed49b625f/deployment/jobhistories?expanded=true",
+}
+
+
+def build_endpoints(**ids):
+    """
+    Fill the endpoint URL templates once with the device/HA/interface/route ids.
+
+    Returns:
+        dict: Endpoint name -> URL, in ENDPOINT_TEMPLATES order.
+    """
+    return {name: template.format(**ids) for name, template in ENDPOINT_TEMPLATES.items()}
+
+
+def load_token(url_token, username):
+    """
+    Return an access token saved by an earlier run if it is still valid, else None.
+    """
+    try:
+        with open(TOKEN_FILE, 'rb') as file:
+            cached = orjson.loads(file.read())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+    if cached.get("url") == url_token and cached.get("username") == username and time.time() < cached.get("expiry", 0) - 60:
+        return cached.get("token")
+    return None
+
+
+def save_token(url_token, username, response):
+    """
+    Save the tokens of a generatetoken response to TOKEN_FILE, readable only by the current user.
+    """
+    os.makedirs(os.path.dirname(TOKEN_FILE), exist_ok=True)
+    fd = os.open(TOKEN_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'wb') as file:
+        file.write(orjson.dumps({
+            "url": url_token,
+            "username": username,
+            "token": response.headers.get("X-auth-access-token"),
+            "refresh_token": response.headers.get("X-auth-refresh-token"),
+            "expiry": time.time() + TOKEN_TTL
+        }))
+
 
 def fmc_conn_test():
     username = 'api_user'
@@ -75,44 +172,85 @@ def fmc_conn_test():
     url_token = "https://192.168.0.201/api/fmc_platform/v1/auth/generatetoken"
     headers = {"Content-Type": "application/json"}
 
-    try:
-        # Generate Token
-        response = requests.post(url_token, headers=headers, auth=(username, password), verify=False)
+    # One pooled session, so every call after the token reuses the same TLS connection(s)
+    session = requests.Session()
+    # Transient FMC errors (rate limiting, busy controller) are retried with backoff; once
+    # retries run out the last response is returned, so the endpoint reports its own status
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset(["GET", "POST", "PUT"]),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_CONCURRENCY, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.verify = False
+    session.headers.update(headers)
+
+    def generate_token():
+        response = session.post(url_token, auth=(username, password))
         response.raise_for_status()
         auth_token = response.headers.get("X-auth-access-token", None)
         if not auth_token:
             raise Exception("Authentication token not found in response.")
-        print(f"Authentication successful! Token: {auth_token}")
-        headers["X-auth-access-token"] = auth_token
+        log.info("Authentication successful! Token: %s", auth_token)
+        save_token(url_token, username, response)
+        return auth_token
+
+    def fetch(url):
+        """GET one endpoint; a failure is reported for that endpoint instead of aborting the run."""
+        try:
+            return get_json(session, url)
+        except requests.exceptions.RequestException as e:
+            return "error", str(e)
+
+    try:
+        # Reuse the token saved by an earlier run, generate one otherwise
+        auth_token = load_token(url_token, username)
+        token_from_file = auth_token is not None
+        if token_from_file:
+            log.info("Reusing saved token: %s", auth_token)
+        else:
+            auth_token = generate_token()
+        session.headers["X-auth-access-token"] = auth_token
 
         device_id = "5f731edc-37b3-11f0-9f97-f415e9865023"
         ha_id = "f05c0e98-370b-11f0-af92-56a023ce6456"
         interface_id = "00000000-0000-0ed3-0000-017179912724"
         statiroute_id = "00000000-0000-0ed3-0000-017179920996"
-        add_device_url = "https://192.168.0.201/api/fmc_config/v1/domain/default/devices/devicerecords"
-        dev_detail_url = f"https://192.168.0.201/api/fmc_config/v1/domain/default/devices/devicerecords/{device_id}"
-        ha_settings_url = f'https://192.168.0.201/api/fmc_config/v1/domain/default/devicehapairs/ftddevicehapairs' 
-        url_devices_int = f"https://192.168.0.201/api/fmc_config/v1/domain/default/devices/devicerecords/{device_id}/physicalinterfaces"
-        url_devices_int_id = f"https://192.168.0.201/api/fmc_config/v1/domain/default/devices/devicerecords/{device_id}/physicalinterfaces/{interface_id}"
-        ha_check_url = f'https://192.168.0.201/api/fmc_config/v1/domain/default/devicehapairs/ftddevicehapairs/{ha_id}'
-        deployments = f'https://192.168.0.201/api/fmc_config/v1/domain/e276abec-e0f2-11e3-8169-6d9ed49b625f/deployment/jobhistories?expanded=true'
-        sec_zones = f'https://192.168.0.201/api/fmc_config/v1/domain/default/object/securityzones'
-        routing = f'https://192.168.0.201/api/fmc_config/v1/domain/default/devices/devicerecords/{device_id}/routing/staticroutes'
-        routing_id = f'https://192.168.0.201/api/fmc_config/v1/domain/default/devices/devicerecords/{device_id}/routing/ipv4staticroutes/{statiroute_id}'
-        object_network = f'https://192.168.0.201/api/fmc_config/v1/domain/default/object/networks'
-
-        response = requests.get(add_device_url, headers=headers, verify=False)
-        response.raise_for_status() 
-        devices = response.json() # Get the first page of devices
-        #print (response.status_code) # Print the status code
-        #print(response.text)
-        print(json.dumps(devices, indent=4)) # Print the devices
+        endpoints = build_endpoints(device_id=device_id, ha_id=ha_id, interface_id=interface_id, statiroute_id=statiroute_id)
+
+        # The read-only GETs are independent of each other, so fetch them concurrently:
+        # total time is roughly the slowest call instead of the sum of all of them
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENCY, len(endpoints))) as executor:
+            results = list(executor.map(fetch, endpoints.values()))
+            if token_from_file and any(status_code == 401 for status_code, _ in results):
+                # The saved token was revoked (FMC restart, logout): authenticate and retry
+                log.info("Saved token rejected, generating a new one.")
+                session.headers["X-auth-access-token"] = generate_token()
+                results = list(executor.map(fetch, endpoints.values()))
+
+        for name, (status_code, body) in zip(endpoints, results):
+            log.info("%s: %s", name, status_code)
+            # Response bodies can be large; only serialize them when -v asks for them
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("%s", orjson.dumps(body, option=orjson.OPT_INDENT_2).decode() if isinstance(body, (dict, list)) else body)
     except requests.exceptions.RequestException as e:
-        print(f"Error: {e}")
+        log.error("Error: %s", e)
         return None
+    finally:
+        session.close()
  
 
 if __name__ == "__main__": 
 
+    parser = argparse.ArgumentParser(description="Test FMC API connectivity.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="pretty-print every response body")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format="%(message)s")
+    # Keep urllib3's own debug output out of -v
+    logging.getLogger("urllib3").setLevel(logging.WARNING)
 
     fmc_conn_test()
\ No newline at end of file